@@ -4,8 +4,16 @@ Problema del Dorayaki (栗まんじゅう問題) - Crecimiento exponencial
 Basado en el episodio de Doraemon con la "Baibain" que duplica objetos cada 5 minutos
 """
 
+import functools
 import math
-import matplotlib.pyplot as plt
+import os
+import sys
+import numpy as np
+
+try:
+    import numba  # Opcional: compila el bucle de evolución
+except ImportError:
+    numba = None
 
 # Constantes y volúmenes de referencia (en metros cúbicos)
 VOLUMEN_DORAYAKI = 0.00015  # Aprox. 150 cm³ por dorayaki (5cm x 5cm x 6cm)
@@ -13,10 +21,61 @@ VOLUMEN_SISTEMA_SOLAR = 3.69e38  # Volumen aproximado del Sistema Solar
 VOLUMEN_TOKYO_DOME = 1.24e6  # 1,240,000 m³
 VOLUMEN_CANICA = 0.0000001  # Aprox. 1 cm³ para una canica pequeña
 VOLUMEN_PELOTA_FUTBOL = 0.0056  # Aprox. 5600 cm³ para pelota estándar
+VOLUMEN_TIERRA = 1.08321e21  # Volumen de la Tierra
+VOLUMEN_SOL = 1.41e27  # Volumen del Sol
+
+# Líneas horizontales de referencia del gráfico comparativo (Tokyo Dome, Sistema Solar)
+REF_YS = np.array([VOLUMEN_TOKYO_DOME, VOLUMEN_SISTEMA_SOLAR])
+_COLORES_REF = ['green', 'orange']
+
+# Relación Sistema Solar / dorayaki, formateada una sola vez para el informe
+_RELACION_SOL_DORAYAKI = VOLUMEN_SISTEMA_SOLAR / VOLUMEN_DORAYAKI
+_RELACION_SOL_DORAYAKI_STR = f"{_RELACION_SOL_DORAYAKI:.2e}"
 
 # Tiempo de duplicación de la Baibain (5 minutos en segundos)
 TIEMPO_DUPLICACION = 5 * 60  # 300 segundos
 
+# Configuración para CodeSpaces: backend sin ventana salvo que se desactive
+MODO_HEADLESS = os.environ.get("DORAYAKI_HEADLESS", "1") == "1"
+
+# Resolución del PNG generado (el coste de rasterizar crece con los píxeles)
+DPI_GRAFICO = int(os.environ.get("DORAYAKI_DPI", "100"))
+
+# matplotlib.pyplot se importa solo al graficar (su importación es costosa)
+_plt = None
+
+# Deja que Agg descarte vértices casi colineales; solo se aplica al dibujar nuestros gráficos
+_RC_SIMPLIFICACION = {'path.simplify': True, 'path.simplify_threshold': 1.0}
+
+# Figura y ejes reutilizados entre llamadas a visualizar_crecimiento_exponencial
+_FIG = None
+_AXES = None
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _kernel_evolucion(volumen_inicial, tiempo_duplicacion, duplicaciones):
+        """Tiempos (minutos) y volúmenes (m³) tras cada duplicación, compilado con Numba"""
+        tiempos = np.empty(duplicaciones + 1)
+        volumenes = np.empty(duplicaciones + 1)
+        for n in range(duplicaciones + 1):
+            tiempos[n] = n * tiempo_duplicacion / 60.0
+            volumenes[n] = math.ldexp(volumen_inicial, n)  # volumen_inicial * 2^n
+        return tiempos, volumenes
+else:
+    def _kernel_evolucion(volumen_inicial, tiempo_duplicacion, duplicaciones):
+        """Tiempos (minutos) y volúmenes (m³) tras cada duplicación, vectorizado con NumPy"""
+        n = np.arange(duplicaciones + 1, dtype=np.int32)
+        return n * (tiempo_duplicacion / 60.0), np.ldexp(volumen_inicial, n)
+
+def _duplicaciones_exactas(volumen_objetivo, volumen_inicial):
+    """ceil(log2(volumen_objetivo / volumen_inicial)) con aritmética entera exacta"""
+    # Con la relación exacta p/q en enteros, ceil(log2(p/q)) = (ceil(p/q) - 1).bit_length()
+    num_objetivo, den_objetivo = volumen_objetivo.as_integer_ratio()
+    num_inicial, den_inicial = volumen_inicial.as_integer_ratio()
+    relacion_techo = -(-(num_objetivo * den_inicial) // (den_objetivo * num_inicial))
+    return (relacion_techo - 1).bit_length()
+
+@functools.lru_cache(maxsize=128)
 def calcular_tiempo_para_volumen(volumen_objetivo, volumen_inicial, tiempo_duplicacion=TIEMPO_DUPLICACION):
     """
     Calcula el tiempo necesario para que un objeto duplicándose alcance un volumen objetivo.
@@ -28,32 +87,78 @@ def calcular_tiempo_para_volumen(volumen_objetivo, volumen_inicial, tiempo_dupli
     
     Returns:
     tuple: (minutos_total, duplicaciones_necesarias, datos_evolucion)
+           datos_evolucion es una tupla (tiempos en minutos, volúmenes en m³) de
+           arrays NumPy listos para graficar. Los arrays son de solo lectura
+           porque el resultado se comparte entre llamadas (memoizado).
     """
     if volumen_inicial <= 0 or volumen_objetivo <= volumen_inicial:
-        return 0, 0, []
+        vacio = np.empty(0)
+        vacio.setflags(write=False)
+        return 0, 0, (vacio, vacio)
     
     # Calcular número de duplicaciones necesarias: volumen_objetivo = volumen_inicial * 2^n
-    duplicaciones_necesarias = math.ceil(math.log2(volumen_objetivo / volumen_inicial))
+    if isinstance(volumen_objetivo, int) and isinstance(volumen_inicial, int):
+        # Volúmenes enteros: directamente por el camino entero, sin coma flotante
+        duplicaciones_necesarias = _duplicaciones_exactas(volumen_objetivo, volumen_inicial)
+    else:
+        relacion = volumen_objetivo / volumen_inicial
+        mantisa, exponente = math.frexp(relacion)
+        if mantisa > 0.5 and math.isfinite(relacion):
+            # relacion = m * 2^e con m en (0.5, 1): el redondeo de la división no puede
+            # cruzar una potencia de 2, así que ceil(log2) es exactamente e
+            duplicaciones_necesarias = exponente
+        else:
+            # Potencia de 2 exacta o desbordamiento: se resuelve con la relación exacta
+            duplicaciones_necesarias = _duplicaciones_exactas(volumen_objetivo, volumen_inicial)
     tiempo_total_segundos = duplicaciones_necesarias * tiempo_duplicacion
     tiempo_total_minutos = tiempo_total_segundos / 60
     tiempo_total_horas = tiempo_total_minutos / 60
     tiempo_total_dias = tiempo_total_horas / 24
     
-    # Generar datos de evolución para gráficos
-    datos_evolucion = []
-    for n in range(duplicaciones_necesarias + 1):
-        tiempo_actual = n * tiempo_duplicacion
-        volumen_actual = volumen_inicial * (2 ** n)
-        datos_evolucion.append((tiempo_actual / 60, volumen_actual, n))  # Tiempo en minutos
+    # Generar datos de evolución para gráficos (tiempo en minutos, volumen en m³)
+    tiempos, volumenes = _kernel_evolucion(
+        float(volumen_inicial), tiempo_duplicacion, duplicaciones_necesarias
+    )
+    tiempos.setflags(write=False)  # Compartidos por la caché
+    volumenes.setflags(write=False)
+    datos_evolucion = (tiempos, volumenes)
     
     return tiempo_total_minutos, duplicaciones_necesarias, datos_evolucion
 
+# Objetivos de referencia para el dorayaki, compartidos por el informe y los gráficos:
+# (nombre en el informe, volumen, etiqueta corta de la barra, color de la barra)
+PUNTOS_REFERENCIA = [
+    ("Canica", VOLUMEN_CANICA, 'Canica\n(1cm³)', 'brown'),
+    ("Pelota de fútbol", VOLUMEN_PELOTA_FUTBOL, 'Pelota', 'blue'),
+    ("Tokyo Dome", VOLUMEN_TOKYO_DOME, 'Tokyo Dome', 'green'),
+    ("Tierra", VOLUMEN_TIERRA, 'Tierra', 'red'),
+    ("Sol", VOLUMEN_SOL, 'Sol', 'purple'),
+    ("Sistema Solar", VOLUMEN_SISTEMA_SOLAR, 'Sistema Solar', 'orange'),
+]
+
+def _tiempos_puntos_referencia():
+    """Minutos y duplicaciones de todos los puntos de referencia en una sola operación vectorizada"""
+    puntos = [punto for punto in PUNTOS_REFERENCIA if punto[1] > VOLUMEN_DORAYAKI]
+    volumenes = np.array([volumen for _, volumen, _, _ in puntos])
+    # Mismo criterio que calcular_tiempo_para_volumen, sin datos de evolución: el exponente
+    # de frexp cuando m > 0.5, y la relación exacta para potencias de 2 o desbordamientos
+    relaciones = volumenes / VOLUMEN_DORAYAKI
+    mantisas, exponentes = np.frexp(relaciones)
+    duplicaciones = exponentes.astype(np.int64)
+    for i in np.flatnonzero(~((mantisas > 0.5) & np.isfinite(relaciones))):
+        duplicaciones[i] = _duplicaciones_exactas(puntos[i][1], VOLUMEN_DORAYAKI)
+    minutos = duplicaciones * (TIEMPO_DUPLICACION / 60)
+    return [
+        (nombre, volumen, tiempo, dup, etiqueta, color)
+        for (nombre, volumen, etiqueta, color), tiempo, dup
+        in zip(puntos, minutos.tolist(), duplicaciones.tolist())
+    ]
+
+# Precalculado una sola vez: (nombre, volumen, minutos, duplicaciones, etiqueta, color)
+TIEMPOS_PUNTOS_REFERENCIA = _tiempos_puntos_referencia()
+
 def problema_dorayaki_sistema_solar():
     """Resuelve el problema principal: dorayaki cubriendo el Sistema Solar"""
-    print("=" * 70)
-    print("PROBLEMA DEL DORAYAKI: ¿CUÁNTO PARA CUBRIR EL SISTEMA SOLAR?")
-    print("=" * 70)
-    
     tiempo_minutos, duplicaciones, datos = calcular_tiempo_para_volumen(
         VOLUMEN_SISTEMA_SOLAR, VOLUMEN_DORAYAKI
     )
@@ -61,185 +166,192 @@ def problema_dorayaki_sistema_solar():
     tiempo_horas = tiempo_minutos / 60
     tiempo_dias = tiempo_horas / 24
     
-    print(f"🍙 VOLÚMENES DE REFERENCIA:")
-    print(f"• 1 Dorayaki: {VOLUMEN_DORAYAKI:.2e} m³")
-    print(f"• Sistema Solar: {VOLUMEN_SISTEMA_SOLAR:.2e} m³")
-    print(f"• Relación: {VOLUMEN_SISTEMA_SOLAR/VOLUMEN_DORAYAKI:.2e} veces mayor")
-    
-    print(f"\n⏰ RESULTADOS:")
-    print(f"• Duplicaciones necesarias: {duplicaciones}")
-    print(f"• Tiempo total: {tiempo_minutos:,.0f} minutos")
-    print(f"• Tiempo total: {tiempo_horas:,.1f} horas")
-    print(f"• Tiempo total: {tiempo_dias:,.1f} días")
-    
-    # Puntos intermedios interesantes
-    puntos_interes = [
-        ("Canica", VOLUMEN_CANICA),
-        ("Pelota de fútbol", VOLUMEN_PELOTA_FUTBOL),
-        ("Tokyo Dome", VOLUMEN_TOKYO_DOME),
-        ("Tierra", 1.08321e21),  # Volumen de la Tierra
-        ("Sol", 1.41e27),        # Volumen del Sol
+    # Se arma el informe completo y se escribe de una sola vez
+    lineas = [
+        "=" * 70,
+        "PROBLEMA DEL DORAYAKI: ¿CUÁNTO PARA CUBRIR EL SISTEMA SOLAR?",
+        "=" * 70,
+        f"🍙 VOLÚMENES DE REFERENCIA:",
+        f"• 1 Dorayaki: {VOLUMEN_DORAYAKI:.2e} m³",
+        f"• Sistema Solar: {VOLUMEN_SISTEMA_SOLAR:.2e} m³",
+        f"• Relación: {_RELACION_SOL_DORAYAKI_STR} veces mayor",
+        f"\n⏰ RESULTADOS:",
+        f"• Duplicaciones necesarias: {duplicaciones}",
+        f"• Tiempo total: {tiempo_minutos:,.0f} minutos",
+        f"• Tiempo total: {tiempo_horas:,.1f} horas",
+        f"• Tiempo total: {tiempo_dias:,.1f} días",
+        # Puntos intermedios interesantes (todos los de referencia por debajo del objetivo)
+        f"\n📊 PUNTOS INTERMEDIOS:",
     ]
-    
-    print(f"\n📊 PUNTOS INTERMEDIOS:")
-    for nombre, volumen in puntos_interes:
-        if volumen > VOLUMEN_DORAYAKI:
-            tiempo, dup, _ = calcular_tiempo_para_volumen(volumen, VOLUMEN_DORAYAKI)
-            print(f"• {nombre}: {tiempo:,.0f} min ({dup} duplicaciones)")
+    lineas.extend(
+        f"• {nombre}: {tiempo:,.0f} min ({dup} duplicaciones)"
+        for nombre, volumen, tiempo, dup, _, _ in TIEMPOS_PUNTOS_REFERENCIA
+        if volumen < VOLUMEN_SISTEMA_SOLAR
+    )
+    sys.stdout.write("\n".join(lineas) + "\n")
     
     return tiempo_minutos, duplicaciones, datos
 
 def problema_tokyo_dome_pelota():
     """Ejemplo adicional: pelota de fútbol llenando el Tokyo Dome"""
-    print("\n" + "=" * 70)
-    print("PROBLEMA ADICIONAL: PELOTA DE FÚTBOL EN TOKYO DOME")
-    print("=" * 70)
-    
     tiempo_minutos, duplicaciones, datos = calcular_tiempo_para_volumen(
         VOLUMEN_TOKYO_DOME, VOLUMEN_PELOTA_FUTBOL
     )
     
-    print(f"⚽ VOLÚMENES:")
-    print(f"• Pelota de fútbol: {VOLUMEN_PELOTA_FUTBOL:.2e} m³")
-    print(f"• Tokyo Dome: {VOLUMEN_TOKYO_DOME:.2e} m³")
-    
-    print(f"\n⏰ RESULTADOS:")
-    print(f"• Duplicaciones necesarias: {duplicaciones}")
-    print(f"• Tiempo total: {tiempo_minutos:,.0f} minutos")
-    print(f"• Tiempo total: {tiempo_minutos/60:,.1f} horas")
+    lineas = [
+        "\n" + "=" * 70,
+        "PROBLEMA ADICIONAL: PELOTA DE FÚTBOL EN TOKYO DOME",
+        "=" * 70,
+        f"⚽ VOLÚMENES:",
+        f"• Pelota de fútbol: {VOLUMEN_PELOTA_FUTBOL:.2e} m³",
+        f"• Tokyo Dome: {VOLUMEN_TOKYO_DOME:.2e} m³",
+        f"\n⏰ RESULTADOS:",
+        f"• Duplicaciones necesarias: {duplicaciones}",
+        f"• Tiempo total: {tiempo_minutos:,.0f} minutos",
+        f"• Tiempo total: {tiempo_minutos/60:,.1f} horas",
+    ]
+    sys.stdout.write("\n".join(lineas) + "\n")
     
     return tiempo_minutos, duplicaciones, datos
 
 def problema_generico(objeto_nombre, volumen_objetivo, volumen_inicial):
     """Función genérica para cualquier objeto y volumen objetivo"""
-    print("\n" + "=" * 70)
-    print(f"PROBLEMA GENÉRICO: {objeto_nombre.upper()}")
-    print("=" * 70)
-    
     tiempo_minutos, duplicaciones, datos = calcular_tiempo_para_volumen(
         volumen_objetivo, volumen_inicial
     )
     
     tiempo_horas = tiempo_minutos / 60
     
-    print(f"📦 VOLÚMENES:")
-    print(f"• Objeto inicial: {volumen_inicial:.2e} m³")
-    print(f"• Volumen objetivo: {volumen_objetivo:.2e} m³")
-    
-    print(f"\n⏰ RESULTADOS:")
-    print(f"• Duplicaciones necesarias: {duplicaciones}")
-    print(f"• Tiempo total: {tiempo_minutos:,.1f} minutos")
-    print(f"• Tiempo total: {tiempo_horas:,.1f} horas")
+    lineas = [
+        "\n" + "=" * 70,
+        f"PROBLEMA GENÉRICO: {objeto_nombre.upper()}",
+        "=" * 70,
+        f"📦 VOLÚMENES:",
+        f"• Objeto inicial: {volumen_inicial:.2e} m³",
+        f"• Volumen objetivo: {volumen_objetivo:.2e} m³",
+        f"\n⏰ RESULTADOS:",
+        f"• Duplicaciones necesarias: {duplicaciones}",
+        f"• Tiempo total: {tiempo_minutos:,.1f} minutos",
+        f"• Tiempo total: {tiempo_horas:,.1f} horas",
+    ]
+    sys.stdout.write("\n".join(lineas) + "\n")
     
     return tiempo_minutos, duplicaciones, datos
 
-def visualizar_crecimiento_exponencial(datos_dorayaki, datos_pelota, datos_genericos=[]):
-    """Visualiza el crecimiento exponencial en gráficos"""
+def _cargar_pyplot():
+    """Importa matplotlib.pyplot la primera vez que se necesita"""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        if MODO_HEADLESS:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
+
+def _obtener_figura():
+    """Devuelve la figura 2x2 reutilizable, creándola si no existe o si su ventana se cerró"""
+    global _FIG, _AXES
+    plt = _cargar_pyplot()
+    # En modo interactivo, cerrar la ventana de show() deja la figura huérfana en pyplot
+    if _FIG is None or not plt.fignum_exists(_FIG.number):
+        _FIG, _AXES = plt.subplots(2, 2, figsize=(15, 10), tight_layout=True)
+    else:
+        for ax in _AXES.flat:
+            ax.clear()
+    return _FIG, _AXES
+
+def visualizar_crecimiento_exponencial(datos_dorayaki, datos_pelota, datos_genericos=[], dpi=DPI_GRAFICO):
+    """Visualiza el crecimiento exponencial en gráficos y los guarda como PNG con la resolución dpi"""
     print("\n" + "=" * 70)
     print("VISUALIZACIÓN DEL CRECIMIENTO EXPONENCIAL")
     print("=" * 70)
     
-    # Configuración para CodeSpaces
-    plt.switch_backend('Agg')
-    
-    # Crear figura con múltiples subgráficos
-    plt.figure(figsize=(15, 10))
-    
-    # Gráfico 1: Crecimiento del dorayaki (escala lineal)
-    if datos_dorayaki:
-        tiempos = [d[0] for d in datos_dorayaki]  # Minutos
-        volumenes = [d[1] for d in datos_dorayaki]  # m³
+    with _cargar_pyplot().rc_context(_RC_SIMPLIFICACION):
+        # Figura con múltiples subgráficos (reutilizada entre llamadas)
+        fig, axes = _obtener_figura()
         
-        plt.subplot(2, 2, 1)
-        plt.plot(tiempos, volumenes, 'r-', linewidth=2, marker='o', markersize=3)
-        plt.axhline(y=VOLUMEN_SISTEMA_SOLAR, color='orange', linestyle='--', 
-                   label='Volumen Sistema Solar')
-        plt.title('Crecimiento del Dorayaki - Escala Lineal', fontweight='bold')
-        plt.xlabel('Tiempo (minutos)')
-        plt.ylabel('Volumen (m³)')
-        plt.yscale('log')  # Usar escala log para mejor visualización
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-    
-    # Gráfico 2: Crecimiento comparativo (escala logarítmica)
-    plt.subplot(2, 2, 2)
-    
-    # Dorayaki
-    if datos_dorayaki:
-        tiempos_d = [d[0] for d in datos_dorayaki]
-        volumenes_d = [d[1] for d in datos_dorayaki]
-        plt.plot(tiempos_d, volumenes_d, 'r-', linewidth=2, label='Dorayaki → Sistema Solar')
-    
-    # Pelota de fútbol
-    if datos_pelota:
-        tiempos_p = [d[0] for d in datos_pelota]
-        volumenes_p = [d[1] for d in datos_pelota]
-        plt.plot(tiempos_p, volumenes_p, 'b-', linewidth=2, label='Pelota → Tokyo Dome')
-    
-    plt.axhline(y=VOLUMEN_SISTEMA_SOLAR, color='orange', linestyle='--', alpha=0.7)
-    plt.axhline(y=VOLUMEN_TOKYO_DOME, color='green', linestyle='--', alpha=0.7)
-    
-    plt.title('Comparación de Crecimiento Exponencial', fontweight='bold')
-    plt.xlabel('Tiempo (minutos)')
-    plt.ylabel('Volumen (m³) - Escala Log')
-    plt.yscale('log')
-    plt.grid(True, alpha=0.3)
-    plt.legend()
-    
-    # Gráfico 3: Número de duplicaciones vs volumen
-    plt.subplot(2, 2, 3)
-    duplicaciones = list(range(0, 101, 10))  # 0 a 100 en pasos de 10
-    factores_crecimiento = [2 ** n for n in duplicaciones]
-    
-    plt.plot(duplicaciones, factores_crecimiento, 'purple', linewidth=2)
-    plt.title('Crecimiento por Número de Duplicaciones', fontweight='bold')
-    plt.xlabel('Número de Duplicaciones')
-    plt.ylabel('Factor de Crecimiento (2^n)')
-    plt.yscale('log')
-    plt.grid(True, alpha=0.3)
-    
-    # Gráfico 4: Tiempos para diferentes objetivos
-    plt.subplot(2, 2, 4)
-    objetivos = [
-        ('Canica\n(1cm³)', VOLUMEN_CANICA),
-        ('Dorayaki', VOLUMEN_DORAYAKI),
-        ('Pelota', VOLUMEN_PELOTA_FUTBOL),
-        ('Tokyo Dome', VOLUMEN_TOKYO_DOME),
-        ('Tierra', 1.08321e21),
-        ('Sistema Solar', VOLUMEN_SISTEMA_SOLAR)
-    ]
-    
-    tiempos_objetivos = []
-    nombres = []
-    
-    for nombre, volumen in objetivos:
-        if volumen > VOLUMEN_DORAYAKI:
-            tiempo, _, _ = calcular_tiempo_para_volumen(volumen, VOLUMEN_DORAYAKI)
-            tiempos_objetivos.append(tiempo)
-            nombres.append(nombre)
-    
-    plt.bar(nombres, tiempos_objetivos, color=['blue', 'green', 'red', 'orange', 'purple', 'brown'])
-    plt.title('Tiempo para Alcanzar Diferentes Objetivos', fontweight='bold')
-    plt.ylabel('Minutos Requeridos')
-    plt.xticks(rotation=45)
-    plt.grid(True, alpha=0.3)
-    
-    # Añadir valores en las barras
-    for i, v in enumerate(tiempos_objetivos):
-        plt.text(i, v + max(tiempos_objetivos)*0.01, f'{v:,.0f}', 
-                ha='center', va='bottom', fontsize=8)
-    
-    plt.tight_layout()
-    plt.savefig('crecimiento_exponencial_dorayaki.png', dpi=150, bbox_inches='tight')
-    plt.show()
+        # Gráfico 1: Crecimiento del dorayaki (escala lineal)
+        tiempos_d, volumenes_d = datos_dorayaki  # Minutos, m³
+        tiempos_p, volumenes_p = datos_pelota
+        
+        if len(tiempos_d):
+            ax = axes[0, 0]
+            # En escala log-y la curva es una recta: basta con sus extremos, sin marcadores
+            ax.plot([tiempos_d[0], tiempos_d[-1]], [volumenes_d[0], volumenes_d[-1]],
+                    'r-', linewidth=2)
+            ax.axhline(y=VOLUMEN_SISTEMA_SOLAR, color='orange', linestyle='--', 
+                       label='Volumen Sistema Solar')
+            ax.set_title('Crecimiento del Dorayaki - Escala Lineal', fontweight='bold')
+            ax.set_xlabel('Tiempo (minutos)')
+            ax.set_ylabel('Volumen (m³)')
+            ax.set_yscale('log')  # Usar escala log para mejor visualización
+            ax.grid(True, alpha=0.3)
+            ax.legend()
+        
+        # Gráfico 2: Crecimiento comparativo (escala logarítmica)
+        ax = axes[0, 1]
+        
+        # Dorayaki
+        if len(tiempos_d):
+            ax.plot(tiempos_d, volumenes_d, 'r-', linewidth=2, label='Dorayaki → Sistema Solar')
+        
+        # Pelota de fútbol
+        if len(tiempos_p):
+            ax.plot(tiempos_p, volumenes_p, 'b-', linewidth=2, label='Pelota → Tokyo Dome')
+        
+        # Una sola LineCollection que abarca todo el ancho de los ejes, como axhline
+        ax.hlines(REF_YS, 0, 1, transform=ax.get_yaxis_transform(),
+                  colors=_COLORES_REF, linestyles='--', alpha=0.7)
+        
+        ax.set_title('Comparación de Crecimiento Exponencial', fontweight='bold')
+        ax.set_xlabel('Tiempo (minutos)')
+        ax.set_ylabel('Volumen (m³) - Escala Log')
+        ax.set_yscale('log')
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+        
+        # Gráfico 3: Número de duplicaciones vs volumen
+        ax = axes[1, 0]
+        duplicaciones = np.arange(0, 101, 10)  # 0 a 100 en pasos de 10
+        factores_crecimiento = np.ldexp(1.0, duplicaciones)  # 2^n como float, sin enteros grandes
+        
+        ax.plot(duplicaciones, factores_crecimiento, 'purple', linewidth=2)
+        ax.set_title('Crecimiento por Número de Duplicaciones', fontweight='bold')
+        ax.set_xlabel('Número de Duplicaciones')
+        ax.set_ylabel('Factor de Crecimiento (2^n)')
+        ax.set_yscale('log')
+        ax.grid(True, alpha=0.3)
+        
+        # Gráfico 4: Tiempos para diferentes objetivos
+        ax = axes[1, 1]
+        etiquetas = [etiqueta for _, _, _, _, etiqueta, _ in TIEMPOS_PUNTOS_REFERENCIA]
+        tiempos_objetivos = [tiempo for _, _, tiempo, _, _, _ in TIEMPOS_PUNTOS_REFERENCIA]
+        colores = [color for _, _, _, _, _, color in TIEMPOS_PUNTOS_REFERENCIA]
+        
+        barras = ax.bar(etiquetas, tiempos_objetivos, color=colores)
+        ax.set_title('Tiempo para Alcanzar Diferentes Objetivos', fontweight='bold')
+        ax.set_ylabel('Minutos Requeridos')
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.grid(True, alpha=0.3)
+        
+        # Añadir valores en las barras
+        ax.bar_label(barras, fmt='{:,.0f}', fontsize=8, padding=3)
+        
+        fig.savefig('crecimiento_exponencial_dorayaki.png', dpi=dpi)
+    # Con Agg show() no hace nada; la figura cacheada se reutiliza en la próxima llamada
+    if not MODO_HEADLESS:
+        _cargar_pyplot().show()
     
     print("✅ Gráfico guardado como 'crecimiento_exponencial_dorayaki.png'")
 
 def main():
     """Función principal del programa"""
-    print("🍙 PROBLEMA DEL DORAYAKI - CRECIMIENTO EXPONENCIAL")
-    print("Basado en el episodio de Doraemon con la 'Baibain'")
-    print("=" * 70)
+    sys.stdout.write(
+        "🍙 PROBLEMA DEL DORAYAKI - CRECIMIENTO EXPONENCIAL\n"
+        "Basado en el episodio de Doraemon con la 'Baibain'\n"
+        + "=" * 70 + "\n"
+    )
     
     try:
         # Resolver problemas principales
@@ -257,31 +369,30 @@ def main():
         visualizar_crecimiento_exponencial(datos_dorayaki, datos_pelota)
         
         # Resumen ejecutivo
-        print("\n" + "=" * 70)
-        print("RESUMEN EJECUTIVO - LECCIONES APRENDIDAS")
-        print("=" * 70)
-        
-        print(f"🎯 TIEMPOS CLAVE:")
-        print(f"• Dorayaki → Sistema Solar: {tiempo_dorayaki/60:,.0f} horas")
-        print(f"• Pelota → Tokyo Dome: {tiempo_pelota:,.0f} minutos")
-        print(f"• Canica → Piscina: {tiempo_canica:,.0f} minutos")
-        
-        print(f"\n💡 LECCIONES SOBRE CRECIMIENTO EXPONENCIAL:")
-        print(f"• Comienza lentamente, luego acelera dramáticamente")
-        print(f"• 10 duplicaciones: ×1,024")
-        print(f"• 20 duplicaciones: ×1,048,576") 
-        print(f"• 30 duplicaciones: ×1,073,741,824")
-        
-        print(f"\n⚠️  APLICACIONES EN LA VIDA REAL:")
-        print(f"• Crecimiento de poblaciones bacterianas")
-        print(f"• Propagación de virus y epidemias")
-        print(f"• Interés compuesto en finanzas")
-        print(f"• Crecimiento de datos digitales")
-        
-        print(f"\n🔍 DATOS CURIOSOS DE DORAEMON:")
-        print(f"• En el episodio original, terminan lanzando los dorayakis al espacio")
-        print(f"• La Baibain duplica objetos cada 5 minutos")
-        print(f"• Es una metáfora del crecimiento exponencial incontrolado")
+        lineas = [
+            "\n" + "=" * 70,
+            "RESUMEN EJECUTIVO - LECCIONES APRENDIDAS",
+            "=" * 70,
+            f"🎯 TIEMPOS CLAVE:",
+            f"• Dorayaki → Sistema Solar: {tiempo_dorayaki/60:,.0f} horas",
+            f"• Pelota → Tokyo Dome: {tiempo_pelota:,.0f} minutos",
+            f"• Canica → Piscina: {tiempo_canica:,.0f} minutos",
+            f"\n💡 LECCIONES SOBRE CRECIMIENTO EXPONENCIAL:",
+            f"• Comienza lentamente, luego acelera dramáticamente",
+            f"• 10 duplicaciones: ×1,024",
+            f"• 20 duplicaciones: ×1,048,576",
+            f"• 30 duplicaciones: ×1,073,741,824",
+            f"\n⚠️  APLICACIONES EN LA VIDA REAL:",
+            f"• Crecimiento de poblaciones bacterianas",
+            f"• Propagación de virus y epidemias",
+            f"• Interés compuesto en finanzas",
+            f"• Crecimiento de datos digitales",
+            f"\n🔍 DATOS CURIOSOS DE DORAEMON:",
+            f"• En el episodio original, terminan lanzando los dorayakis al espacio",
+            f"• La Baibain duplica objetos cada 5 minutos",
+            f"• Es una metáfora del crecimiento exponencial incontrolado",
+        ]
+        sys.stdout.write("\n".join(lineas) + "\n")
         
     except Exception as e:
         print(f"❌ Error durante la ejecución: {e}")